@@ -3,7 +3,7 @@
 
 
 import json
-from datetime import datetime, timedelta
+from datetime import timedelta
 
 from influxdb import InfluxDBClient
 
@@ -11,7 +11,7 @@ from influxdb import InfluxDBClient
 def datetimetostr(dt):
     if dt.utcoffset() is None:
         return f"{dt.isoformat()}Z"
-    if dt.utcoffset() == datetime.timedelta(0):
+    if dt.utcoffset() == timedelta(0):
         return f"{dt.replace(tzinfo=None).isoformat()}Z"
     return dt.isoformat()
 
@@ -2,13 +2,54 @@ import datetime
 import logging
 import os
 import re
+from functools import lru_cache
 
 import pexpect
 from termcolor import colored
 
 from boardfarm.dbclients.influx_db_helper import Influx_DB_Logger
+from boardfarm.exceptions import CodeError
 from boardfarm.lib.regexlib import AllValidIpv6AddressesRegex, ValidIpv4AddressRegex
 
+_TIME_RE = re.compile(r"Time: (.*)\r")
+_SSH_CONTROL_PATH = "/tmp/bf-ssh-%r@%h:%p"
+# files smaller than this (in bytes) are read over the console, not copied
+_INLINE_READ_MAX_SIZE = 4096
+# printed instead of the file content when the file has to be copied
+_COPY_MARKER = "__BF_COPY_FILE__"
+# factor to convert an iperf rate in the given unit to Mbps
+_UNIT_TO_MBITS = {
+    "bits": 1 / (1024 * 1024),
+    "bytes": 8 / (1024 * 1024),
+    "kbits": 1 / 1024,
+    "kbytes": 8 / 1024,
+    "mbits": 1,
+    "mbytes": 8,
+    "gbits": 1024 * 1,
+    "gbytes": 1024 * 8,
+}
+# [SUM]  <start>-<end>  sec  <transfer> <unit>  <bitrate> ...
+_SUM_RE = re.compile(
+    r"^[ \t]*\[SUM\][ \t]+(?P<start>\S+?)-(?P<end>\S+)[ \t]+\S+"
+    r"[ \t]+(?P<transfer>\S+)[ \t]+(?P<unit>\S+)[ \t]+(?P<bitrate>\S+)[^\r\n]*",
+    re.M,
+)
+_ID_RE = re.compile(r"^.*\[ ID\].*$", re.M)
+_PROTO_RE = {
+    re.compile(
+        f"local {ValidIpv4AddressRegex} port.*connected to {ValidIpv4AddressRegex}"
+    ): "ipv4",
+    re.compile(
+        f"local {AllValidIpv6AddressesRegex} port.*connected to {AllValidIpv6AddressesRegex}"
+    ): "ipv6",
+}
+
+
+@lru_cache(maxsize=256)
+def _parse_iperf_time(timestamp):
+    # server and client logs of one run usually carry the same timestamp
+    return datetime.datetime.strptime(timestamp, "%a, %d %b %Y %H:%M:%S %Z")
+
 
 class GenericWrapper:
     def __init__(self, **kwargs):
@@ -26,18 +67,6 @@ class GenericWrapper:
         self.iperf_server_data = None
         self.iperf_client_data = None
 
-        # set data in Mbps
-        self.units = {
-            "bits": 1,
-            "bytes": 8,
-            "kbits": 1024 * 1,
-            "kbytes": 1024 * 8,
-            "mbits": 1024 * 1024 * 1,
-            "mbytes": 1024 * 1024 * 8,
-            "gbits": 1024 * 1024 * 1024 * 1,
-            "gbytes": 1024 * 1024 * 1024 * 8,
-        }
-
     def get_details_dict(self, device, fname):
         logger = logging.getLogger("bft")
         data_dict = {}
@@ -53,10 +82,7 @@ class GenericWrapper:
             return
 
         if "Time:" in val:
-            timestamp = re.search(r"Time: (.*)\r", val).group(1)
-            timestamp = datetime.datetime.strptime(
-                timestamp, "%a, %d %b %Y %H:%M:%S %Z"
-            )
+            timestamp = _parse_iperf_time(_TIME_RE.search(val).group(1))
         else:
             logger.warning(
                 colored(
@@ -68,16 +94,18 @@ class GenericWrapper:
             return
 
         data_dict["mode"] = "udp" if "Datagrams" in val else "tcp"
-        if "Connecting to host" in val:
-            data_dict["port"] = re.search(
-                r"Connecting to host (.*), port (\d+)\r", val
-            ).group(2)
+        client_idx = val.find("Connecting to host ")
+        server_idx = val.find("Server listening on ")
+        if client_idx >= 0:
+            # Connecting to host <host>, port <port>\r
+            line = val[client_idx : val.find("\r", client_idx)]
+            data_dict["port"] = line.rsplit("port ", 1)[1]
             data_dict["device"] = data_dict["tag"] = "client"
             data_dict["flow"] = "DS" if "Reverse mode" in val else "US"
-        elif "Server listening on" in val:
-            data_dict["port"] = re.search(r"(Server listening on (\d+)\r)", val).group(
-                2
-            )
+        elif server_idx >= 0:
+            # Server listening on <port>\r
+            server_idx += len("Server listening on ")
+            data_dict["port"] = val[server_idx : val.find("\r", server_idx)].strip()
             data_dict["device"] = data_dict["tag"] = "server"
             data_dict["flow"] = "see client"
         else:
@@ -90,10 +118,8 @@ class GenericWrapper:
             )
             return
 
-        proto_dict = {ValidIpv4AddressRegex: "ipv4", AllValidIpv6AddressesRegex: "ipv6"}
-        for k, v in proto_dict.items():
-            match = re.search(f"local {k} port.*connected to {k}", val)
-            if match:
+        for pattern, v in _PROTO_RE.items():
+            if pattern.search(val):
                 data_dict["protocol"] = v
                 break
         else:
@@ -115,35 +141,47 @@ class GenericWrapper:
         self.collect_logs("client", client, client_data)
         self.log_data()
 
-    def _copy_file_locally(self, dev, fname, dir="/tmp/", prompt=r":.*(\$|#)"):
+    def _copy_file_locally(self, dev, fname, dir="/tmp/"):
+        # the first copy opens a shared ssh master connection, later copies
+        # from the same device reuse it and skip the handshake and password
         command = (
-            f"scp -o StrictHostKeyChecking=no -P {dev.port}"
-            f" {dev.username}@{dev.ipaddr}:{fname} {dir}"
+            f"scp -o StrictHostKeyChecking=no -o ControlMaster=auto"
+            f" -o ControlPath={_SSH_CONTROL_PATH} -o ControlPersist=60s"
+            f" -P {dev.port} {dev.username}@{dev.ipaddr}:{fname} {dir}"
         )
-        cli = pexpect.spawn("/bin/bash", echo=False)
-        cli.sendline(command)
-        cli.expect("assword:")
-        cli.sendline(dev.password)
-        cli.expect(prompt)
+        cli = pexpect.spawn(command, echo=False, encoding="utf-8")
+        password_sent = False
+        while cli.expect(["assword:", pexpect.EOF]) == 0:
+            if password_sent:
+                # asked again, the password was rejected
+                cli.close(force=True)
+                raise CodeError(
+                    f"scp of {fname} from {dev.ipaddr} failed: wrong password"
+                )
+            cli.sendline(dev.password)
+            password_sent = True
+        cli.close()
+        if cli.exitstatus != 0:
+            # otherwise _get_data reads a missing or stale local copy
+            raise CodeError(
+                f"scp of {fname} from {dev.ipaddr} failed: {cli.before.strip()}"
+            )
 
     def _get_data(self, device, data_list, idx):
-        lines = int(device.check_output(f"cat {data_list[idx]['logfile']}|wc -l"))
-        if lines < 2:
-            # for small files we can work off the propmt
-            startline = 1
-            buf = ""
-            while lines > 0:
-                buf += device.check_output(
-                    f"sed -n '{startline},{startline+10}p' {data_list[idx]['logfile']}"
-                )
-                lines -= 10
-                startline += 10
-        else:
-            # for big files we copy them to /tmp and load them directly
-            self._copy_file_locally(device, data_list[idx]["logfile"])
-            with open(f'/tmp/{os.path.basename(data_list[idx]["logfile"])}') as f:
-                buf = f.read()
-        return [i.strip() for i in buf.split("\n") if i.strip() != ""][1:]
+        # both paths return the log stripped and with LF line endings, so that
+        # the offset stored by collect_logs stays valid whichever path is taken
+        # for small files we can work off the propmt, the size check and the
+        # read share one command so they cost a single prompt round-trip
+        buf = device.check_output(
+            f"[ $(stat -c %s {data_list[idx]['logfile']}) -lt {_INLINE_READ_MAX_SIZE} ]"
+            f" && sed -n '1,$p' {data_list[idx]['logfile']} || echo {_COPY_MARKER}"
+        )
+        if buf != _COPY_MARKER:
+            return buf.replace("\r\n", "\n")
+        # for big files we copy them to /tmp and load them directly
+        self._copy_file_locally(device, data_list[idx]["logfile"])
+        with open(f'/tmp/{os.path.basename(data_list[idx]["logfile"])}') as f:
+            return f.read().strip()
 
     def collect_logs(self, tag, device, iperf_data):
         if tag == "client":
@@ -154,44 +192,39 @@ class GenericWrapper:
             raise ValueError("Invalid tag value")
 
         for idx in range(len(data_list)):
-            meta = self._get_data(device, data_list, idx)
+            buf = self._get_data(device, data_list, idx)
             meta_dict = data_list[idx]
             meta_dict["data"] = []
             last_index = None
-            if meta_dict["last_index"] in meta:
-                meta = meta[meta.index(meta_dict["last_index"]) + 1 :]
-            for i in meta:
-                if "[ ID]" in i and meta_dict["fields"] is None:
-                    meta_dict["fields"] = i.split()[2:5]
-                if i.startswith("[SUM]"):
-                    last_index = i
-                    temp = {}
-                    line = i.split()
-                    temp["type"] = (
-                        "data"
-                        if float(line[1].split("-")[1]) - float(line[1].split("-")[0])
-                        < 2
-                        else "result"
-                    )
-                    if line[4].lower() in self.units.keys():
-                        temp["value"] = [
-                            line[1].split("-")[1],
-                            str(
-                                round(
-                                    float(line[3])
-                                    * self.units[line[4].lower()]
-                                    / self.units["mbits"],
-                                    3,
-                                )
-                            ),
-                            line[5],
-                        ]
-                        meta_dict["data"].append(temp)
+            # resume after the last [SUM] line seen on the previous run, unless
+            # the log got shorter in between (i.e. it was rewritten)
+            pos = meta_dict["last_index"] or 0
+            if pos > len(buf):
+                pos = 0
+            if meta_dict["fields"] is None:
+                header = _ID_RE.search(buf, pos)
+                if header:
+                    meta_dict["fields"] = header.group(0).split()[2:5]
+            for match in _SUM_RE.finditer(buf, pos):
+                last_index = match.end()
+                end = match.group("end")
+                temp = {}
+                temp["type"] = (
+                    "data" if float(end) - float(match.group("start")) < 2 else "result"
+                )
+                ratio = _UNIT_TO_MBITS.get(match.group("unit").lower())
+                if ratio is not None:
+                    temp["value"] = [
+                        end,
+                        f"{float(match.group('transfer')) * ratio:.3f}",
+                        match.group("bitrate"),
+                    ]
+                    meta_dict["data"].append(temp)
             meta_dict["last_index"] = last_index
 
     def get_response_data(self, response_time, service, timestamp=None):
         if not timestamp:
-            timestamp = datetime.datetime.utcnow()
+            timestamp = datetime.datetime.now(datetime.timezone.utc)
         data_dict = {
             "fields": ["Response time"],
             "value": [response_time],
@@ -202,7 +235,7 @@ class GenericWrapper:
 
     def get_utilization_data(self, utilization, service, timestamp=None):
         if not timestamp:
-            timestamp = datetime.datetime.utcnow()
+            timestamp = datetime.datetime.now(datetime.timezone.utc)
         data_dict = {
             "fields": list(utilization.keys()),
             "value": list(utilization.values()),
@@ -49,13 +49,10 @@ class DebianWAN(debian.DebianBox):
                 "www.google.com": [str(self.gw)],
             }
         )
-        self.sendline("killall iperf ab hping3 webfsd")
-        self.expect(self.prompt)
-
-        # potential cleanup so this wan device works
-        self.sendline("iptables -t nat -X")
-        self.expect(self.prompt)
-        self.sendline("iptables -t nat -F")
+        # kill leftovers and potential cleanup so this wan device works
+        self.sendline(
+            "killall iperf ab hping3 webfsd; iptables -t nat -X; iptables -t nat -F"
+        )
         self.expect(self.prompt)
 
         # set WAN ip address
@@ -66,14 +63,15 @@ class DebianWAN(debian.DebianBox):
             self.expect(self.prompt)
             self.gw = self.get_interface_ipaddr(self.iface_dut)
         elif not self.wan_no_eth0:
-            self.sendline(f"ifconfig {self.iface_dut} {self.gw_ng}")
-            self.expect(self.prompt)
-            self.sendline(f"ifconfig {self.iface_dut} up")
-            self.expect(self.prompt)
+            cmds = [
+                f"ifconfig {self.iface_dut} {self.gw_ng}",
+                f"ifconfig {self.iface_dut} up",
+            ]
             if self.static_route is not None:
-                self.send(f"ip route del {self.static_route.split(' via ')[0]}; ")
-                self.sendline(f"ip route add {self.static_route}")
-                self.expect(self.prompt)
+                cmds.append(f"ip route del {self.static_route.split(' via ')[0]}")
+                cmds.append(f"ip route add {self.static_route}")
+            self.sendline("; ".join(cmds))
+            self.expect(self.prompt)
             if self.wan_dhcp_server:
                 self.setup_dhcp_server()
 
@@ -93,21 +91,20 @@ class DebianWAN(debian.DebianBox):
                 self.gwv6 = self.get_interface_ip6addr(self.iface_dut)
         elif self.gwv6 is not None:
             # we are bypass this for now (see http://patchwork.ozlabs.org/patch/117949/)
-            self.sendline(f"sysctl -w net.ipv6.conf.{self.iface_dut}.accept_dad=0")
-            self.expect(self.prompt)
-            self.sendline(
-                f"ip -6 addr add {self.gwv6}/{self.ipv6_prefix} dev {self.iface_dut}"
-            )
-            self.expect(self.prompt)
+            cmds = [
+                f"sysctl -w net.ipv6.conf.{self.iface_dut}.accept_dad=0",
+                f"ip -6 addr add {self.gwv6}/{self.ipv6_prefix} dev {self.iface_dut}",
+            ]
             static_route6 = getattr(self, "static_route6", "")
             if static_route6:
-                self.sendline(f"ip -6 route add {static_route6} dev {self.iface_dut}")
-                self.expect(self.prompt)
+                cmds.append(f"ip -6 route add {static_route6} dev {self.iface_dut}")
+            self.sendline("; ".join(cmds))
+            self.expect(self.prompt)
 
         # configure routing
-        self.sendline("sysctl net.ipv4.ip_forward=1")
-        self.expect(self.prompt)
-        self.sendline("sysctl net.ipv6.conf.all.forwarding=0")
+        self.sendline(
+            "sysctl net.ipv4.ip_forward=1; sysctl net.ipv6.conf.all.forwarding=0"
+        )
         self.expect(self.prompt)
 
         if self.wan_no_eth0 or self.wan_dhcp:
@@ -116,18 +113,14 @@ class DebianWAN(debian.DebianBox):
             wan_uplink_iface = "eth0"
 
         wan_ip_uplink = self.get_interface_ipaddr(wan_uplink_iface)
-        self.sendline(
+        cmds = [
             "iptables -t nat -A POSTROUTING -o %s -j SNAT --to-source %s"
-            % (wan_uplink_iface, wan_ip_uplink)
-        )
-        self.expect(self.prompt)
-
-        self.sendline("echo 0 > /proc/sys/net/ipv4/tcp_timestamps")
-        self.expect(self.prompt)
-        self.sendline("echo 0 > /proc/sys/net/ipv4/tcp_sack")
-        self.expect(self.prompt)
-
-        self.sendline(f"ifconfig {self.iface_dut}")
+            % (wan_uplink_iface, wan_ip_uplink),
+            "echo 0 > /proc/sys/net/ipv4/tcp_timestamps",
+            "echo 0 > /proc/sys/net/ipv4/tcp_sack",
+            f"ifconfig {self.iface_dut}",
+        ]
+        self.sendline("; ".join(cmds))
         self.expect(self.prompt)
 
         self.turn_off_pppoe()
@@ -357,7 +357,7 @@ class DockerFactory(linux.LinuxDevice):
         :type path: string
         """
         if path:
-            if any(list(map(lambda x: x in path, ["http://", "https://"]))):
+            if any(scheme in path for scheme in ("http://", "https://")):
                 self.sendline(f"curl -O {path}")
                 self.expect_prompt(timeout=120)
                 path = path.split("/")[-1]
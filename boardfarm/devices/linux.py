@@ -25,6 +25,14 @@ from boardfarm.lib.regexlib import (
 from . import base
 
 BFT_DEBUG = "BFT_DEBUG" in os.environ
+# scp calls to the same host reuse one ssh connection for a minute
+_SCP_SSH_OPTS = (
+    "-o StrictHostKeyChecking=no -o UserKnownHostsFile=/dev/null"
+    " -o ControlMaster=auto -o ControlPath=/tmp/bf-ssh-%r@%h:%p"
+    " -o ControlPersist=60s"
+)
+# host key question and password prompt, compiled once for every scp call
+_SCP_LOGIN_PATTERNS = [re.compile("continue connecting?"), re.compile("assword:")]
 logger = logging.getLogger("bft")
 
 
@@ -692,8 +700,9 @@ EOFEOFEOFEOF"""
         :type options : str, default to empty
         """
         if port:
-            if re.search(AllValidIpv6AddressesRegex, host_ip) and "[" not in host_ip:
-                host_ip = "[" + host_ip + "]"
+            with suppress(ValueError):
+                if ipaddress.ip_address(host_ip).version == 6:
+                    host_ip = "[" + host_ip + "]"
             web_addr = f"{protocol}://{host_ip}:{str(port)}"
         else:
             web_addr = f"{protocol}://{host_ip}"
@@ -758,24 +767,34 @@ EOFEOFEOFEOF"""
 
         if action == "download":
             command = (
-                f"{scp_command} -o StrictHostKeyChecking=no -o UserKnownHostsFile"
-                f"=/dev/null -q -P {port} {username}@{host}:{src_path} {dst_path}"
+                f"{scp_command} {_SCP_SSH_OPTS} -q -P {port}"
+                f" {username}@{host}:{src_path} {dst_path}"
             )
         else:
             command = (
-                f"{scp_command} -o StrictHostKeyChecking=no -o UserKnownHostsFile"
-                f"=/dev/null -q -P {port} {src_path} {username}@{host}:{dst_path}"
+                f"{scp_command} {_SCP_SSH_OPTS} -q -P {port}"
+                f" {src_path} {username}@{host}:{dst_path}"
             )
         print(f"Sending {command}")
         self.sendline(command)
-        first_time = self.expect(
-            [pexpect.TIMEOUT, "continue connecting?"], timeout=timeout
-        )
-        if first_time:
-            self.sendline("y")
-        self.expect("assword:", timeout=timeout)
-        self.sendline(password)
-        self.expect_prompt(timeout=timeout)
+        # a reused connection does not ask for the password again
+        password_sent = False
+        while True:
+            idx = self.expect(_SCP_LOGIN_PATTERNS + self.prompt, timeout=timeout)
+            if idx == 0:
+                self.sendline("y")
+            elif idx == 1:
+                if password_sent:
+                    # asked again, the password was rejected
+                    self.sendcontrol("c")
+                    self.expect_prompt(timeout=timeout)
+                    raise CodeError(f"scp to {username}@{host} failed: wrong password")
+                self.sendline(password)
+                password_sent = True
+            else:
+                break
+        if "Permission denied" in self.before:
+            raise CodeError(f"scp to {username}@{host} failed: {self.before.strip()}")
 
     def get_date(self):
         """Get the system date and time
@@ -15,6 +15,7 @@ import re
 import sys
 import time
 from collections import defaultdict
+from functools import lru_cache
 
 import pexpect
 from nested_lookup import nested_lookup
@@ -28,6 +29,17 @@ from boardfarm.lib.installers import apt_install
 logger = logging.getLogger("bft")
 
 
+# interface objects are immutable, so identical option values can share one
+@lru_cache(maxsize=32)
+def _ipv4_interface(value):
+    return ipaddress.IPv4Interface(value)
+
+
+@lru_cache(maxsize=32)
+def _ipv6_interface(value):
+    return ipaddress.IPv6Interface(value)
+
+
 class DebianBox(linux.LinuxDevice):
     """A linux machine running an ssh server."""
 
@@ -43,6 +55,53 @@ class DebianBox(linux.LinuxDevice):
     init_static_ip = ipaddress.ip_address("192.168.0.10")
     ipv6_prefix = 64
 
+    def _parse_static_ipv6_option(self, value):
+        if "/" not in value:
+            value += "/%s" % str(self.ipv6_prefix)
+        self.ipv6_interface = _ipv6_interface(value)
+        self.ipv6_prefix = self.ipv6_interface._prefixlen
+        self.gwv6 = self.ipv6_interface.ip
+
+    def _parse_static_ip_option(self, value):
+        if "/" not in value:
+            value += "/24"
+        self.gw_ng = _ipv4_interface(value)
+        self.nw = self.gw_ng.network
+        self.gw_prefixlen = self.nw._prefixlen
+        self.gw = self.gw_ng.ip
+        self.static_ip = True
+
+    def _parse_static_route_option(self, value):
+        self.static_route = value.replace("-", " via ")
+
+    def _parse_static_route6_option(self, value):
+        self.static_route6 = value.replace("-", " via ")
+
+    def _parse_mgmt_dns_option(self, value):
+        self.mgmt_dns = _ipv4_interface(value.strip()).ip
+
+    def _parse_lan_fixed_route_to_wan_option(self, value):
+        self.lan_fixed_route_to_wan = self.options["lan-fixed-route-to-wan"]
+
+    # options that only toggle an attribute: option -> (attribute, value)
+    _flag_options = {
+        "dante": ("dante", True),
+        "wan-dhcp-client-v6": ("wan_dhcpv6", True),
+        "wan-no-dhcp-server": ("wan_dhcp_server", False),
+        "wan-no-eth0": ("wan_no_eth0", True),
+        "wan-dhcp-client": ("wan_dhcp", True),
+    }
+    # options handled by a parser, "name:" for options carrying a value
+    _option_handlers = {
+        "wan-static-ipv6:": _parse_static_ipv6_option,
+        "wan-static-ip:": _parse_static_ip_option,
+        "static-route:": _parse_static_route_option,
+        "static-route6:": _parse_static_route6_option,
+        "wan-static-route:": _parse_static_route_option,
+        "mgmt_dns:": _parse_mgmt_dns_option,
+        "lan-fixed-route-to-wan": _parse_lan_fixed_route_to_wan_option,
+    }
+
     def parse_device_options(self, *args, **kwargs):
         self.args = args
         self.kwargs = {}
@@ -72,55 +131,15 @@ class DebianBox(linux.LinuxDevice):
         if "options" in kwargs:
             for opt in kwargs["options"].split(","):
                 opt = opt.strip()
-                if opt == "dante":
-                    self.dante = True
-                elif opt == "wan-dhcp-client-v6":
-                    self.wan_dhcpv6 = True
-                elif opt == "wan-no-dhcp-server":
-                    self.wan_dhcp_server = False
-                elif opt == "wan-no-eth0":
-                    self.wan_no_eth0 = True
-                elif opt == "wan-dhcp-client":
-                    self.wan_dhcp = True
-                elif opt.startswith("wan-static-ipv6:"):
-                    ipv6_address = str(  # noqa : F821
-                        opt.replace("wan-static-ipv6:", "")
-                    )
-                    if "/" not in opt:
-                        ipv6_address += "/%s" % str(  # noqa : F821
-                            str(self.ipv6_prefix)
-                        )
-                    self.ipv6_interface = ipaddress.IPv6Interface(  # noqa : F821
-                        ipv6_address
-                    )
-                    self.ipv6_prefix = self.ipv6_interface._prefixlen
-                    self.gwv6 = self.ipv6_interface.ip
-                elif opt.startswith("wan-static-ip:"):
-                    value = str(opt.replace("wan-static-ip:", ""))  # noqa : F401
-                    if "/" not in value:
-                        value += "/24"
-                    self.gw_ng = ipaddress.IPv4Interface(value)  # noqa : F821
-                    self.nw = self.gw_ng.network
-                    self.gw_prefixlen = self.nw._prefixlen
-                    self.gw = self.gw_ng.ip
-                    self.static_ip = True
-                elif opt.startswith("static-route:"):
-                    self.static_route = opt.replace("static-route:", "").replace(
-                        "-", " via "
-                    )
-                elif opt.startswith("static-route6:"):
-                    self.static_route6 = opt.replace("static-route6:", "").replace(
-                        "-", " via "
-                    )
-                elif opt.startswith("wan-static-route:"):
-                    self.static_route = opt.replace("wan-static-route:", "").replace(
-                        "-", " via "
-                    )
-                elif opt.startswith("mgmt_dns:"):
-                    value = opt.replace("mgmt_dns:", "").strip()
-                    self.mgmt_dns = ipaddress.IPv4Interface(value).ip  # noqa : F821
-                elif opt == "lan-fixed-route-to-wan":
-                    self.lan_fixed_route_to_wan = self.options[opt]
+                if opt in self._flag_options:
+                    attr, value = self._flag_options[opt]
+                    setattr(self, attr, value)
+                    continue
+                # valued options are looked up with their trailing ":"
+                opt_name, sep, opt_value = opt.partition(":")
+                handler = self._option_handlers.get(opt_name + sep)
+                if handler:
+                    handler(self, opt_value)
 
         if pre_cmd_host is not None:
             sys.stdout.write("\tRunning pre_cmd_host.... ")
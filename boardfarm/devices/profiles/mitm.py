@@ -113,7 +113,7 @@ class MITM(base_profile.BaseProfile):
         host = f"{device_name}.boardfarm.com"
         if device:
             self.dev_mgr.wan.modify_dns_hosts(
-                {host: device.dns.dnsv4[host] + device.dns.dnsv6[host]}
+                {host: device.dns.dnsv4.get(host, []) + device.dns.dnsv6.get(host, [])}
             )
             self.mitm_dns_active.remove(device_name)
         else:
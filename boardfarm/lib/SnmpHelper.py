@@ -6,10 +6,10 @@
 # This file is distributed under the Clear BSD license.
 # The full text can be found in LICENSE in the root directory.
 
+import ipaddress
 import json
 import logging
 import os
-import re
 
 import debtcollector
 import pexpect
@@ -24,7 +24,6 @@ from pysnmp.hlapi import ObjectIdentifier
 import boardfarm
 
 from .installers import install_pysnmp
-from .regexlib import AllValidIpv6AddressesRegex, ValidIpv4AddressRegex
 
 logger = logging.getLogger("bft")
 
@@ -521,10 +520,7 @@ def snmp_asyncore_walk(
         "the snmp_asyncore_walk function can be slower than a simple"
         " snmpwalk, refer to the SNMP wiki"
     )
-    if re.search(ValidIpv4AddressRegex, ip_address):
-        mode = "ipv4"
-    elif re.search(AllValidIpv6AddressesRegex, ip_address):
-        mode = "ipv6"
+    mode = f"ipv{ipaddress.ip_address(ip_address).version}"
     install_pysnmp(device)
     asyncore_script = "asyncore_snmp.py"
     fname = os.path.join(
@@ -14,10 +14,12 @@ import json
 import logging
 import netrc
 import os
+import random
 import re
 import ssl
 import sys
 import time
+import uuid
 from datetime import datetime
 from typing import List, Union
 
@@ -57,6 +59,9 @@ ubootprompt = ["ath>", r"\(IPQ\) #", "ar7240>"]
 linuxprompt = ["root\\@.*:.*#", "@R7500:/# "]
 prompts = ubootprompt + linuxprompt + ["/.* # "]
 
+# upper bound of a single retry backoff, unless the base timeout is larger
+_RETRY_MAX_BACKOFF = 30
+
 
 def run_once(f):
     """Run a function only once.
@@ -1214,30 +1219,47 @@ def hex2ipv6(hexstr):
     )
 
 
-def retry(func_name, max_retry, *args):
+def _retry_backoff(tout, attempt, backoff=False):
+    """Return the sleep time before the next attempt.
+
+    Without backoff this is always tout. With backoff the sleep doubles on
+    every attempt, starting from tout and capped at _RETRY_MAX_BACKOFF (or
+    tout if larger), with up to 10% of jitter.
+    """
+    if not backoff:
+        return tout
+    sleep = min(tout * 2**attempt, max(tout, _RETRY_MAX_BACKOFF))
+    return sleep + random.uniform(0, tout * 0.1)
+
+
+def retry(func_name, max_retry, *args, backoff=False):
     """Retry a function if the output of the function is false.
 
+    Sleeps 5 seconds between attempts, none after the last one.
+
     :param func_name: name of the function to retry
     :type func_name: Object
     :param max_retry: Maximum number of times to be retried
     :type max_retry: Integer
     :param args: Arguments passed to the function
     :type args: args
+    :param backoff: double the sleep after every attempt, up to 30 seconds, with some jitter, defaults to False
+    :type backoff: Boolean, Optional
     :return: Output of the function if function is True
     :rtype: Boolean (True/False) or None Type(None)
     """
     output = None
-    for _ in range(max_retry):
+    for attempt in range(max_retry):
         output = func_name(*args)
         if output and output != "False":
             return output
-        else:
-            time.sleep(5)
-    else:
-        return output
+        # no point in waiting after the last attempt
+        if attempt < max_retry - 1:
+            time.sleep(_retry_backoff(5, attempt, backoff))
+    return output
 
 
-def retry_on_exception(method, args, retries=10, tout=5):
+def retry_on_exception(method, args, retries=10, tout=5, backoff=False):
     """Retry a method if any exception occurs.
 
     Eventually, at last, throw the exception.
@@ -1251,6 +1273,8 @@ def retry_on_exception(method, args, retries=10, tout=5):
     :type retries: Integer, Optional
     :param tout: Sleep time after every exception occur, defaults to 5
     :type tout: Integer, Optional
+    :param backoff: double the sleep after every exception, starting from tout up to 30 seconds, with some jitter, defaults to False
+    :type backoff: Boolean, Optional
     :return: Output of the function
     :rtype: Any data type
     """
@@ -1263,7 +1287,7 @@ def retry_on_exception(method, args, retries=10, tout=5):
                     "method failed %d time (%s)" % ((not_used + 1), e), attrs=["bold"]
                 )
             )
-            time.sleep(tout)
+            time.sleep(_retry_backoff(tout, not_used, backoff))
     return method(*args)
 
 
@@ -1834,9 +1858,7 @@ def hex_to_datetime(output):
     """
     out = output.replace("0x", "")
     mib_Hex = [out[i : i + 2] for i in range(0, len(out), 2)]
-    dt = datetime(
-        *list(map(lambda x: int(x, 16), [mib_Hex[0] + mib_Hex[1]] + mib_Hex[2:]))
-    )
+    dt = datetime(*(int(x, 16) for x in [mib_Hex[0] + mib_Hex[1]] + mib_Hex[2:]))
     return dt
 
 
@@ -2144,16 +2166,28 @@ def domain_ip_reach_check(device, reachable_count, unreachable_count, nslookup_o
     :type nslookup_output: dictionary
     :rtype: boolean
     """
-    reachable = unreachable = 0
+    reachable = 0
     ping_ip = nslookup_output["domain_ip_addr"]
-    for ip in ping_ip:
-        output = device.check_output(f"ping -c 4 {ip}")
-        match = re.search("4 packets transmitted, 4.*received, 0% packet loss", output)
-        if match:
-            reachable += 1
-        else:
-            unreachable += 1
-    return int(reachable) == reachable_count and int(unreachable) == unreachable_count
+    if ping_ip:
+        # the console runs one command at a time, so start every ping in the
+        # background on the device, one short command each so that the echo
+        # never wraps, and collect the per-address logs at once. Only these
+        # pings are waited for, other jobs may run on the console, and the
+        # logs are unique per call.
+        logs = f"/tmp/domain_ip_ping_{uuid.uuid4().hex[:8]}"
+        for idx, ip in enumerate(ping_ip):
+            pids = "$!" if idx == 0 else '"$bf_pings $!"'
+            device.check_output(
+                f"ping -c 4 {ip} > {logs}_{idx}.txt 2>&1 & bf_pings={pids}"
+            )
+        output = device.check_output(
+            f"wait $bf_pings; cat {logs}_*.txt; rm -f {logs}_*.txt"
+        )
+        reachable = len(
+            re.findall("4 packets transmitted, 4.*received, 0% packet loss", output)
+        )
+    unreachable = len(ping_ip) - reachable
+    return reachable == reachable_count and unreachable == unreachable_count
 
 
 def send_to_elasticsearch(elastic_url, data):
@@ -2293,11 +2327,8 @@ def ip_pool_to_list(
     ip address of the pool
     :rtype: List[ipaddress.IPv4Address]
     """
-    ip_list = []
-    while end_ip >= start_ip and start_ip != end_ip + 1:
-        ip_list.append(start_ip)
-        start_ip += 1
-    return ip_list
+    address_type = type(start_ip)
+    return [address_type(ip) for ip in range(int(start_ip), int(end_ip) + 1)]
 
 
 def install_app_via_wan(
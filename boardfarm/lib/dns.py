@@ -1,6 +1,5 @@
 import ipaddress
 import re
-from collections import defaultdict
 
 from boardfarm.lib.linux_nw_utility import NwDnsLookup
 from boardfarm.lib.regexlib import AllValidIpv6AddressesRegex, ValidIpv4AddressRegex
@@ -9,18 +8,35 @@ from boardfarm.lib.regexlib import AllValidIpv6AddressesRegex, ValidIpv4AddressR
 class DNS:
     """To get the dns IPv4 and IPv6"""
 
+    __slots__ = (
+        "device",
+        "device_options",
+        "aux_options",
+        "aux_url",
+        "url",
+        "dnsv4",
+        "dnsv6",
+        "auxv4",
+        "auxv6",
+        "hosts_v4",
+        "hosts_v6",
+        "nslookup",
+    )
+
     def __init__(self, device, device_options, aux_options, aux_url=None):
         self.device = device
         self.device_options = device_options
         self.aux_options = aux_options
         self.aux_url = aux_url
         self.url = self.device.name + ".boardfarm.com"
-        self.dnsv4 = defaultdict(list)
-        self.dnsv6 = defaultdict(list)
+        # the device url and the optional aux url are the only host keys
+        urls = [self.url, self.aux_url] if self.aux_url else [self.url]
+        self.dnsv4 = {url: [] for url in urls}
+        self.dnsv6 = {url: [] for url in urls}
         self.auxv4 = None
         self.auxv6 = None
-        self.hosts_v4 = defaultdict(list)
-        self.hosts_v6 = defaultdict(list)
+        self.hosts_v4 = {}
+        self.hosts_v6 = {}
         self._add_dns_hosts()
         self._add_dnsv6_hosts()
         if self.aux_options:
@@ -99,13 +115,20 @@ class DNS:
         :param unreachable_ipv6: no.of unreachable IPv6 address for acs url
         :type unreachable_ipv6: int
         """
-        val_v4 = self.hosts_v4[self.url][:reachable_ipv4]
-        val_v6 = self.hosts_v6[self.url][:reachable_ipv6]
-        self.hosts_v4[self.url] = val_v4
-        self.hosts_v6[self.url] = val_v6
-        for val in range(unreachable_ipv4):
-            ipv4 = self.auxv4 + (val + 1)
-            self.hosts_v4[self.url].append(str(ipv4))
-        for val in range(unreachable_ipv6):
-            ipv6 = self.auxv6 + (val + 1)
-            self.hosts_v6[self.url].append(str(ipv6))
+        # unreachable addresses are the ones following the aux address
+        hosts_v4 = self.hosts_v4[self.url][:reachable_ipv4]
+        if unreachable_ipv4:
+            base = int(self.auxv4)
+            hosts_v4.extend(
+                str(ipaddress.IPv4Address(base + val))
+                for val in range(1, unreachable_ipv4 + 1)
+            )
+        hosts_v6 = self.hosts_v6[self.url][:reachable_ipv6]
+        if unreachable_ipv6:
+            base = int(self.auxv6)
+            hosts_v6.extend(
+                str(ipaddress.IPv6Address(base + val))
+                for val in range(1, unreachable_ipv6 + 1)
+            )
+        self.hosts_v4[self.url] = hosts_v4
+        self.hosts_v6[self.url] = hosts_v6
@@ -22,6 +22,8 @@ class DnsParser:
         :type response: str
         :return: dict obj
         """
+        # parsed output starts afresh so that one parser can be reused
+        self.dns_dict_obj = {}
         val = response.replace("\t\t", " ").replace("\t", " ")
         for i in val.split("\r\n\r\n"):
             if "Server" in i:
@@ -328,19 +328,22 @@ class EnvHelper:
         # find all possible devices.
         # Selection criteria: they have a "device_type" key.
         # They're always found inside a list
-        def find_device_arrays(env):
-            nonlocal devices
-            for k, v in env.items():
+        # walk the nested dicts depth first with an explicit stack of
+        # iterators, a nested dict is entered before its siblings
+        stack = [iter(env_json.items())]
+        while stack:
+            for k, v in stack[-1]:
                 if type(v) == dict:
                     if "device_type" in v:
                         devices[k] = [v]
-                    find_device_arrays(v)
+                    stack.append(iter(v.items()))
+                    break
                 if type(v) == list and all(
                     type(obj) == dict and "device_type" in obj for obj in v
                 ):
                     devices[k] = v
-
-        find_device_arrays(env_json)
+            else:
+                stack.pop()
         return devices
 
     def get_update_image(self, mirror=True):
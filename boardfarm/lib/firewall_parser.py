@@ -13,10 +13,12 @@ class iptable_parser:
         self.chain_info = []
 
     def _get_header(self, ip_tables):
+        self.header = None
         for line in ip_tables.splitlines():
             if line.startswith("num"):
                 self.header = line.split()
                 break
+        assert self.header, "No rule header found in table output"
         return self.header
 
     def iptables(self, ip_tables):
@@ -25,6 +27,8 @@ class iptable_parser:
         :param ip_tables: iptables output from DUT
         :return: dict of iptable
         """
+        # parsed rules start afresh so that one parser can be reused
+        self.table_rule = {}
         header = self._get_header(ip_tables)
         split_chain = re.split(r"Chain", ip_tables)
         self.key = None
@@ -54,6 +58,7 @@ class iptable_parser:
         :param ip_tables: iptables output from dut
         :return: dict of iptable
         """
+        self.table_rule = {}
         header = self._get_header(ip6_tables)
         header.remove("opt")
         split_chain = re.split(r"Chain", ip6_tables)
@@ -1,5 +1,7 @@
+import ipaddress
 import re
-from typing import Union
+from contextlib import suppress
+from typing import Optional, Union
 
 from boardfarm.exceptions import CodeError
 from boardfarm.lib.dns_parser import DnsParser
@@ -14,6 +16,17 @@ from boardfarm.lib.nw_utility_stub import (
     PingStub,
 )
 
+# job id and pid printed by the shell when a command is sent to background
+_BG_PID_RE = re.compile(r"(\[\d{1,10}\]\s(\d{1,6}))")
+_PING_LOSS_RE = re.compile(r"(\d+)% loss")
+
+# snapshot length enough for the packet headers, see start_tcpdump
+DEFAULT_HEADER_SNAPLEN = 128
+
+# the parsers reset their output on every parse call, share one of each
+_IPTABLES_PARSER = iptable_parser()
+_DNS_PARSER = DnsParser()
+
 
 class DeviceNwUtility(NwUtilityStub):
     def __init__(self, parent_device):
@@ -23,13 +36,20 @@ class DeviceNwUtility(NwUtilityStub):
         out = self.dev.check_output(f"netstat {opts} {extra_opts}")
         return NetstatParser().parse_inet_output_linux(out)
 
-    def start_tcpdump(self, fname: str, interface: str, filters: str = "") -> str:
+    def start_tcpdump(
+        self,
+        fname: str,
+        interface: str,
+        filters: str = "",
+        snaplen: Optional[int] = None,
+    ) -> str:
         """Starts a tcpdump capture on the shell prompt of the linux console
 
         Args:
             fname (str): name of the pcap file
             interface (str): interface at which the tcp traffic listens to
             filters (str, optional): additional filters to add into the command. Defaults to ""
+            snaplen (int, optional): bytes captured per packet, e.g. DEFAULT_HEADER_SNAPLEN when only the headers are needed. Payloads are truncated but the pcap gets much smaller and faster to read and copy. Defaults to None, i.e. full packets
 
         Returns:
             str: return the process id of the tcpdump capture
@@ -39,7 +59,7 @@ class DeviceNwUtility(NwUtilityStub):
             interface,
             capture_file=fname,
             return_pid=True,
-            additional_filters=f"-s0 {filters}",
+            additional_filters=f"-s{snaplen or 0} {filters}",
         )
 
     def stop_tcpdump(self, pid: str) -> None:
@@ -130,37 +150,39 @@ class NwFirewall(NwFirewallStub):
     def __init__(self, parent_device):
         self.dev = parent_device
 
+    @staticmethod
+    def _is_table_empty(out):
+        # rule lines start with their number, no need to parse the whole table
+        assert "Chain" in out, "Invalid table name or Table doesn't exist"
+        # without the num header the digit scan below cannot tell rules apart
+        assert any(
+            line.startswith("num") for line in out.splitlines()
+        ), "Table listed without --line-numbers"
+        return not any(line[:1].isdigit() for line in out.splitlines())
+
     def get_iptables_list(self, opts="", extra_opts=""):
         out = self.dev.check_output(f"iptables {opts} {extra_opts}")
-        return iptable_parser().ip6tables(out)
+        return _IPTABLES_PARSER.ip6tables(out)
 
     def get_iptables_policy(self, opts="", extra_opts=""):
         out = self.dev.check_output(f"iptables {opts} {extra_opts}")
-        return iptable_parser().iptables_policy(out)
+        return _IPTABLES_PARSER.iptables_policy(out)
 
     def is_iptable_empty(self, opts="", extra_opts=""):
         out = self.dev.check_output(f"iptables {opts} {extra_opts}")
-        check_out = iptable_parser().ip6tables(out)
-        check_empty = (
-            True if len([True for i in check_out.values() if i]) == 0 else False
-        )
-        return check_empty
+        return self._is_table_empty(out)
 
     def get_ip6tables_list(self, opts="", extra_opts=""):
         out = self.dev.check_output(f"ip6tables {opts} {extra_opts}")
-        return iptable_parser().ip6tables(out)
+        return _IPTABLES_PARSER.ip6tables(out)
 
     def get_ip6tables_policy(self, opts="", extra_opts=""):
         out = self.dev.check_output(f"ip6tables {opts} {extra_opts}")
-        return iptable_parser().iptables_policy(out)
+        return _IPTABLES_PARSER.iptables_policy(out)
 
     def is_ip6table_empty(self, opts="", extra_opts=""):
         out = self.dev.check_output(f"ip6tables {opts} {extra_opts}")
-        check_out = iptable_parser().ip6tables(out)
-        check_empty = (
-            True if len([True for i in check_out.values() if i]) == 0 else False
-        )
-        return check_empty
+        return self._is_table_empty(out)
 
     def add_drop_rule_iptables(self, option, valid_ip):
         """
@@ -169,22 +191,28 @@ class NwFirewall(NwFirewallStub):
         :param valid_ip : dest_ip to be blocked from device
         :type valid_ip : valid ip string
         """
-        out = self.dev.check_output(f"iptables -C INPUT {option} {valid_ip} -j DROP")
-        if re.search(rf"host\/network.*{valid_ip}.*not found", out):
+        # check and insert in one go, the rule is only inserted when the check
+        # exits with 1, i.e. the rule is missing, not on any other error
+        out = self.dev.check_output(
+            f"iptables -C INPUT {option} {valid_ip} -j DROP"
+            f" || [ $? -ne 1 ] || iptables -I INPUT 1 {option} {valid_ip} -j DROP"
+        )
+        if "host/network" in out and valid_ip in out and "not found" in out:
             raise CodeError(
                 f"Firewall rule cannot be added as the ip address: {valid_ip} could not be found"
             )
-        if "Bad rule" in out:
-            self.dev.check_output(f"iptables -I INPUT 1 {option} {valid_ip} -j DROP")
 
     def add_drop_rule_ip6tables(self, option, valid_ip):
-        out = self.dev.check_output(f"ip6tables -C INPUT {option} {valid_ip} -j DROP")
-        if re.search(rf"host\/network.*{valid_ip}.*not found", out):
+        # check and insert in one go, the rule is only inserted when the check
+        # exits with 1, i.e. the rule is missing, not on any other error
+        out = self.dev.check_output(
+            f"ip6tables -C INPUT {option} {valid_ip} -j DROP"
+            f" || [ $? -ne 1 ] || ip6tables -I INPUT 1 {option} {valid_ip} -j DROP"
+        )
+        if "host/network" in out and valid_ip in out and "not found" in out:
             raise CodeError(
                 f"Firewall rule cannot be added as the ip address: {valid_ip} could not be found"
             )
-        if "Bad rule" in out:
-            self.dev.check_output(f"ip6tables -I INPUT 1 {option} {valid_ip} -j DROP")
 
     def del_drop_rule_iptables(self, option, valid_ip):
         """
@@ -208,7 +236,29 @@ class NwDnsLookup(NwDnsLookupStub):
 
     def nslookup(self, domain_name, opts="", extra_opts=""):
         out = self.dev.check_output(f"nslookup {opts} {domain_name} {extra_opts}")
-        return DnsParser().parse_nslookup_output(out)
+        return _DNS_PARSER.parse_nslookup_output(out)
+
+    def short(self, domain_name, opts=""):
+        """Resolve the IPv4 and IPv6 addresses of a domain with ``dig +short``.
+
+        Lighter than nslookup when only the addresses are needed, the output
+        needs no parsing beyond dropping the CNAME lines.
+
+        :param domain_name: domain name to resolve
+        :type domain_name: str
+        :param opts: additional dig options, defaults to ""
+        :type opts: str
+        :return: resolved addresses, IPv4 first
+        :rtype: list
+        """
+        out = self.dev.check_output(
+            f"dig +short {opts} {domain_name} A {domain_name} AAAA"
+        )
+        addresses = []
+        for line in out.splitlines():
+            with suppress(ValueError):
+                addresses.append(str(ipaddress.ip_address(line.strip())))
+        return addresses
 
 
 class DHCP(DHCPStub):
@@ -238,11 +288,11 @@ class Ping(PingStub):
 
     def ping_background(self, ip, opts):
         output = self.dev.check_output(f"ping {opts} {ip} > ping.txt &")
-        return re.search(r"(\[\d{1,10}\]\s(\d{1,6}))", output).group(2)
+        return _BG_PID_RE.search(output).group(2)
 
     def loss_percentage(self, pid):
         output = self.dev.check_output(f"kill -3 {pid}")
-        return re.search(r"(\d+)% loss", output).group(1)
+        return _PING_LOSS_RE.search(output).group(1)
 
     def kill_ping_background(self, pid):
         # SIGINT is used to get the ping statistics fetch it if any test required
@@ -2,7 +2,6 @@
 """
 
 import collections
-from io import BytesIO
 
 from pandas import DataFrame
 
@@ -18,49 +17,36 @@ class NetstatParser:
 
     def parse_inet_output_linux(self, output):
         """method to parse the netstat output"""
-        sample_bytes = bytes(output, "utf-8")
-        file_out = BytesIO(sample_bytes)
-        value = file_out.readline()[:5].decode("utf-8")
-        counter = 0
-        while "Proto" not in value:
-            header = file_out.readline()
-            value = header[:5].decode("utf-8")
-            counter += 1
-            if counter == 20:
-                raise Exception("Output has not been returned properly")
-        val = file_out.readlines()
-        for line in val:
-            if "Active UNIX domain sockets" in str(line):
+        lines = iter(output.splitlines())
+        for _ in range(21):
+            header = next(lines, "")
+            if "Proto" in header[:5]:
                 break
-            inet_header, result = self.parse_inet_connection_linux(line, header)
+        else:
+            raise Exception("Output has not been returned properly")
+        fields1, inet_header = self.parse_inet_header_linux(header)
+        # the header is the same for every line, build the record type once
+        inet_connection = collections.namedtuple("inet_connection", inet_header)
+        for line in lines:
+            if "Active UNIX domain sockets" in line:
+                break
+            result = self.parse_inet_connection_linux(line, fields1, inet_connection)
             if result:
                 self.inet_connections.append(result)
         df = DataFrame(self.inet_connections, columns=inet_header)
         return df
 
-    def parse_inet_connection_linux(self, line, header, sep=" "):
-        """string.split(' ')  can not split fileds with multiple spaces between field -> filtering
-        header of UNIX/inet family is fixed, a namedtuple is declared and return by parsing
-        all decimal string is not cast into integer!!!
-        unknown field is a single slash '-',  -> replaced by None,
-        "*" means any IP/port in ascii format;  in numeric format:  0.0.0.0 means ANY IP address
+    def parse_inet_header_linux(self, header):
+        """split the netstat header into its column names
+        "Local Address" and "Foreign Address" are split into address and port columns,
+        "PID/Program name" into PID and Program columns
+        returns the raw column names alongside the resulting dataframe header
         """
-        line = line.decode("utf-8").split(sep)
-        header = header.decode("utf-8").split(sep)
-        fields = [
-            it.replace("\r\n", "")
-            for it in line
-            if it != sep and it != "" and it != "\r\n"
-        ]
-        fields1 = [
-            it1.replace("-", "")
-            for it1 in header
-            if it1 != " " and it1 != "" and it1 not in "\r\n"
-        ]
         fields1 = [
-            word for word in fields1 if word not in "Address" and word not in "name"
+            word
+            for word in header.replace("-", "").split()
+            if word not in "Address" and word not in "name"
         ]
-        dict_val = {}
         inet_header = []
         for val in fields1:
             if val == "Local":
@@ -74,10 +60,20 @@ class NetstatParser:
                 inet_header.append("Program")
             else:
                 inet_header.append(val)
-        inet_connection = collections.namedtuple("inet_connection", inet_header)
+        return fields1, inet_header
+
+    def parse_inet_connection_linux(self, line, fields1, inet_connection):
+        """str.split() collapses the multiple spaces between the fields
+        header of UNIX/inet family is fixed, the namedtuple built from it is filled by parsing
+        all decimal string is not cast into integer!!!
+        unknown field is a single slash '-',  -> replaced by None,
+        "*" means any IP/port in ascii format;  in numeric format:  0.0.0.0 means ANY IP address
+        """
+        fields = line.split()
+        if not fields:
+            return
+        dict_val = {}
         try:
-            if len(fields) < 1:
-                return
             for idx in range(len(fields1)):
                 if fields1[idx] == "Local" or fields1[idx] == "Foreign":
                     portpos = fields[idx].rfind(":")
@@ -90,7 +86,7 @@ class NetstatParser:
                         idx = idx - 1
                     dict_val["PID"], dict_val["Program"] = fields[idx].split("/")
                 else:
-                    dict_val[fields1[idx].replace("-", "")] = fields[idx]
-            return inet_header, inet_connection(**dict_val)
+                    dict_val[fields1[idx]] = fields[idx]
+            return inet_connection(**dict_val)
         except Exception:
             raise Exception(f"Problem in parsing the output for the line {line}!!!")
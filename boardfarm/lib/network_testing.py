@@ -24,6 +24,12 @@ sip_msg = namedtuple("SIPData", ["src_ip", "dest_ip", "message"])
 rtp_msg = namedtuple("RTPMessage", ["src_ip", "dest_ip"])
 logger = logging.getLogger("bft")
 
+# job id and pid printed by the shell when a command is sent to background
+_BG_PID_RE = re.compile(r"(\[\d{1,10}\]\s(\d{1,6}))")
+# read size and prompt search window used while reading large console outputs
+_READ_CHUNK_SIZE = 65536
+_PROMPT_SEARCH_WINDOW = 4096
+
 
 def tcpdump_capture(
     device,
@@ -62,8 +68,12 @@ def tcpdump_capture(
         f"tcpdump -Z root -C 2 -W {filecount}  -U -i {interface} -n -w {capture_file} "
     )
     run_background = " &"
-    filter_str = " ".join([" ".join(i) for i in filters.items()]) if filters else ""
-    filter_str += additional_filters
+    filter_str = " ".join(f"{k} {v}" for k, v in filters.items()) if filters else ""
+    if additional_filters:
+        # keep the filters apart, e.g. "-c 4" followed by "-s0"
+        filter_str = (
+            f"{filter_str} {additional_filters}" if filter_str else additional_filters
+        )
     if port:
         device.sudo_sendline(
             base + f"'portrange {port}' " + filter_str + run_background
@@ -72,7 +82,7 @@ def tcpdump_capture(
         device.sudo_sendline(base + filter_str + run_background)
     device.expect_exact(f"tcpdump: listening on {interface}")
     if return_pid:
-        return re.search(r"(\[\d{1,10}\]\s(\d{1,6}))", device.before).group(2)
+        return _BG_PID_RE.search(device.before).group(2)
     return device.before
 
 
@@ -130,7 +140,16 @@ def tcpdump_read(device, capture_file, protocol="", opts="", timeout=30, rm_pcap
     if opts:
         protocol = protocol + " and " + opts
     device.sudo_sendline(f"tcpdump -n -r {capture_file} {protocol}")
-    device.expect(device.prompt, timeout=timeout)
+    # a capture can print a lot, read it in large chunks and only search the
+    # tail for the prompt instead of rescanning the whole output on each read
+    maxread = device.maxread
+    device.maxread = _READ_CHUNK_SIZE
+    try:
+        device.expect(
+            device.prompt, timeout=timeout, searchwindowsize=_PROMPT_SEARCH_WINDOW
+        )
+    finally:
+        device.maxread = maxread
     output = device.before
     if rm_pcap:
         device.sudo_sendline(f"rm {capture_file}")
@@ -46,6 +46,10 @@ class NwDnsLookupStub:
     def nslookup(self, domain_name, opts="", extra_opts=""):
         raise NotImplementedError
 
+    @abc.abstractmethod
+    def short(self, domain_name, opts=""):
+        raise NotImplementedError
+
 
 class DHCPStub:
     class DHCPClientStub:
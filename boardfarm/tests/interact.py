@@ -20,15 +20,22 @@ logger = logging.getLogger("bft")
 class Interact(rootfs_boot.RootFSBootTest):
     """Interact with console, wan, lan, wlan connections and re-run tests."""
 
-    def print_dynamic_devices(self):
-        """Print dynamic devices."""
+    def get_dynamic_devices_lines(self):
+        """Return the menu line of every dynamic device."""
+        lines = []
         for device in self.config.devices:
             d = getattr(self.config, device)
             # TODO: should move all classes to use string repr
             if hasattr(d, "username"):
-                print(f"  {device} device:    ssh {d.username}@{d.name}")
+                lines.append(f"  {device} device:    ssh {d.username}@{d.name}")
             else:
-                print(f"  {d.name} device:    {d}")
+                lines.append(f"  {d.name} device:    {d}")
+        return lines
+
+    def print_dynamic_devices(self, lines=None):
+        """Print dynamic devices."""
+        for line in self.get_dynamic_devices_lines() if lines is None else lines:
+            print(line)
 
     def test_main(self):
         """Function to interact menu."""
@@ -50,10 +57,15 @@ class Interact(rootfs_boot.RootFSBootTest):
             print(error)
             return
 
+        device_lines = None
         while True:
+            # devices may come and go during an interactive session, the
+            # listing is rebuilt only after one returns
+            if device_lines is None:
+                device_lines = self.get_dynamic_devices_lines()
             print("\n\nCurrent station")
             print(f"  Board console: {self.config.board.get('conn_cmd')}")
-            self.print_dynamic_devices()
+            self.print_dynamic_devices(device_lines)
             print(
                 "Pro-tip: Increase kernel message verbosity with\n"
                 '    echo "7 7 7 7" > /proc/sys/kernel/printk'
@@ -85,11 +97,13 @@ class Interact(rootfs_boot.RootFSBootTest):
             if key in self.config.devices:
                 d = getattr(self.config, key)
                 d.interact()
+                device_lines = None
 
             i = 1
             for c in board.consoles:
                 if key == str(i):
                     c.interact()
+                    device_lines = None
                 i += 1
 
             if key == str(i):
@@ -126,6 +140,7 @@ class Interact(rootfs_boot.RootFSBootTest):
                         print(e)
                         continue
                     finally:
+                        device_lines = None
                         func = getattr(
                             tests.available_tests[test].__class__,
                             "teardown_class",
@@ -147,6 +162,7 @@ class Interact(rootfs_boot.RootFSBootTest):
                 board.reset()
                 print("Press Ctrl-] to stop interaction and return to menu")
                 board.interact()
+                device_lines = None
                 continue
             i += 1
 
@@ -162,6 +178,7 @@ class Interact(rootfs_boot.RootFSBootTest):
                     vars.update(locals())
                     shell = code.InteractiveConsole(vars)
                     shell.interact()
+                    device_lines = None
                 except Exception as error:
                     print(error)
                     print("Unable to spawn interactive shell!")
@@ -6,6 +6,7 @@ import re
 import time
 from contextlib import contextmanager
 from dataclasses import dataclass
+from functools import cached_property
 from ipaddress import IPv4Address, IPv6Address, ip_address
 from typing import Any, Dict, Generator, List, Optional, Tuple, Union
 
@@ -37,6 +38,9 @@ from .voice import VoiceClient
 
 logger = logging.getLogger("bft")
 
+# terminal escape sequences left in console output
+_ANSI_ESCAPE_RE = re.compile(r"\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])")
+
 
 @dataclass
 class IPAddresses:
@@ -105,19 +109,43 @@ class HTTPResult:
                     f"Curl Failure due to the following reason {response}"
                 )
             else:
-                raw_search_output = re.findall(r"\<(\!DOC|head).*\>", response, re.S)
-                raw = raw_search_output[0] if raw_search_output else ""
+                # body runs from the doctype or head tag up to the last tag
+                raw = ""
+                starts = [
+                    idx
+                    for idx in (response.find("<!DOC"), response.find("<head"))
+                    if idx != -1
+                ]
+                if starts:
+                    start, end = min(starts), response.rfind(">")
+                    if end > start:
+                        raw = response[start : end + 1]
 
-                code_search_output = re.findall(r"< HTTP\/.*\s(\d+)", response)
-                code = code_search_output[0] if code_search_output else ""
+                # status line is "< HTTP/<version> <code> <reason>"
+                code = ""
+                start = response.find("< HTTP/")
+                if start != -1:
+                    end = response.find("\n", start)
+                    status = response[start : end if end != -1 else None].split()
+                    if len(status) > 2 and status[2].isdigit():
+                        code = status[2]
 
-                beautified_text = ""
-                if raw:
-                    beautified_text = BeautifulSoup(raw, "html.parser").prettify()
+                return raw, code
 
-                return raw, code, beautified_text
+        self.raw, self.code = parse_response(response)
 
-        self.raw, self.code, self.beautified_text = parse_response(response)
+    @cached_property
+    def beautified_text(self) -> str:
+        """Return the prettified HTML of the response body.
+
+        The body is only parsed on first access.
+
+        :return: prettified HTML, empty if the response has no body
+        :rtype: str
+        """
+        if not self.raw:
+            return ""
+        return BeautifulSoup(self.raw, "html.parser").prettify()
 
 
 @contextmanager
@@ -262,7 +290,7 @@ def http_get(
 
 @contextmanager
 def tcpdump_on_board(
-    fname: str, interface: str, filters: str = ""
+    fname: str, interface: str, filters: str = "", snaplen: Optional[int] = None
 ) -> Generator[str, None, None]:
     """Contextmanager to perform tcpdump on the board.
 
@@ -274,13 +302,19 @@ def tcpdump_on_board(
     :type interface: str
     :param filters: Additional filters for the tcpdump command, defaults to ""
     :type filters: str, optional
+    :param snaplen: bytes captured per packet, defaults to None (full packets)
+    :type snaplen: int, optional
     :yield: Yields the process id of the tcp capture started
     :rtype: Generator[str, None, None]
     """
     pid: str = ""
     board = get_device_by_name("board")
     try:
-        pid = board.nw_utility.start_tcpdump(fname, interface, filters=filters)
+        # only pass snaplen when asked, board utilities may not support it
+        kwargs = {"snaplen": snaplen} if snaplen else {}
+        pid = board.nw_utility.start_tcpdump(
+            fname, interface, filters=filters, **kwargs
+        )
         yield pid
     finally:
         board.nw_utility.stop_tcpdump(pid)
@@ -532,9 +566,7 @@ def resolve_dns(
     """
     record_type = "AAAA" if ipv6 else "A"
     dig_command_output = host.check_output(f"dig {opts} {record_type} {domain_name}")
-    dig_command_output = re.compile(r"\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])").sub(
-        "", dig_command_output
-    )
+    dig_command_output = _ANSI_ESCAPE_RE.sub("", dig_command_output)
     result = jc.parsers.dig.parse(dig_command_output.split(";", 1)[-1])
     if result:
         return result
@@ -1265,8 +1297,7 @@ def _nmap(
     port = f"-p {port}" if port else ""
     cmd = f"nmap {protocol or ''} {port} -Pn -r {opts or ''} {ipaddr} {retries} {rate} -oX -"
     xml = source_device.check_output(cmd, timeout=timeout)
-    xmlre = re.compile(r"\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])")
-    xml = xmlre.sub("", xml).strip()
+    xml = _ANSI_ESCAPE_RE.sub("", xml).strip()
     return xmltodict.parse(xml)
 
 
@@ -0,0 +1,148 @@
+"""Unit tests for the iperf log collection of the influx wrapper."""
+import os
+import uuid
+
+import pytest
+
+from boardfarm.dbclients import influx_wrapper
+from boardfarm.dbclients.influx_wrapper import GenericWrapper
+from boardfarm.exceptions import CodeError
+
+IPERF_LOG = """Connecting to host 10.0.0.1, port 5201
+[  5] local 10.0.0.2 port 40000 connected to 10.0.0.1 port 5201
+[ ID] Interval           Transfer     Bitrate         Retr  Cwnd
+[  5]   0.00-1.00   sec  11.2 MBytes  94.0 Mbits/sec    0    400 KBytes
+[SUM]   0.00-1.00   sec  11.2 MBytes  94.0 Mbits/sec    0
+[SUM]   1.00-2.00   sec   900 KBytes  7.3 Mbits/sec    0
+[SUM]   2.00-3.00   sec  1.1 GBytes   940 Mbits/sec    0
+- - - - - - - - - - - - - - - - - - - - - - - - -
+[SUM]   0.00-10.00  sec   112 MBytes  94.0 Mbits/sec    0             sender
+[SUM]   0.00-10.00  sec   112 MBytes  94.0 Mbits/sec                  receiver
+"""
+
+IPERF_LOG_DATA = [
+    {"type": "data", "value": ["1.00", "89.600", "94.0"]},
+    {"type": "data", "value": ["2.00", "7.031", "7.3"]},
+    {"type": "data", "value": ["3.00", "9011.200", "940"]},
+    {"type": "result", "value": ["10.00", "896.000", "94.0"]},
+    {"type": "result", "value": ["10.00", "896.000", "94.0"]},
+]
+
+IPERF_LOG_MORE = "[SUM]  10.00-11.00  sec  5 Mbits  5 Mbits/sec\n"
+
+
+class DeviceStub:
+    port = 22
+    username = "root"
+    ipaddr = "192.168.1.1"
+    password = "bigfoot1"
+
+    def __init__(self, log="", inline=True):
+        self.log = log
+        self.inline = inline
+
+    def check_output(self, cmd):
+        # the console echoes CRLF line endings, the copied file keeps LF
+        if self.inline:
+            return self.log.strip().replace("\n", "\r\n")
+        return influx_wrapper._COPY_MARKER
+
+
+class SpawnStub:
+    """Replay the given expect() indexes, then exit with exitstatus."""
+
+    def __init__(self, matches, exitstatus=0, before=""):
+        self.matches = list(matches)
+        self.exitstatus = exitstatus
+        self.before = before
+        self.sent = []
+
+    def expect(self, patterns):
+        return self.matches.pop(0)
+
+    def sendline(self, line):
+        self.sent.append(line)
+
+    def close(self, force=False):
+        pass
+
+
+def _copy(mocker, spawn):
+    mocker.patch.object(influx_wrapper.pexpect, "spawn", return_value=spawn)
+    GenericWrapper()._copy_file_locally(DeviceStub(), "/tmp/iperf.log")
+
+
+@pytest.mark.parametrize("matches", [[0, 1], [1]])
+def test_copy_file_locally(mocker, matches):
+    spawn = SpawnStub(matches)
+    _copy(mocker, spawn)
+    assert spawn.sent == [DeviceStub.password] * matches.count(0)
+
+
+def test_copy_file_locally_wrong_password(mocker):
+    spawn = SpawnStub([0, 0])
+    with pytest.raises(CodeError, match="wrong password"):
+        _copy(mocker, spawn)
+    assert spawn.sent == [DeviceStub.password]
+
+
+def test_copy_file_locally_failed(mocker):
+    spawn = SpawnStub([1], exitstatus=1, before="No such file or directory\r\n")
+    with pytest.raises(CodeError, match="No such file or directory"):
+        _copy(mocker, spawn)
+
+
+@pytest.fixture
+def iperf_data():
+    logfile = f"/tmp/iperf_{uuid.uuid4().hex}.log"
+    yield {"logfile": logfile, "last_index": None, "fields": None}
+    # the copied log lands in /tmp under the same basename
+    if os.path.exists(logfile):
+        os.remove(logfile)
+
+
+@pytest.fixture
+def wrapper(mocker):
+    def copy(self, dev, fname, dir="/tmp/"):
+        with open(os.path.join(dir, os.path.basename(fname)), "w") as f:
+            f.write(dev.log)
+
+    mocker.patch.object(
+        GenericWrapper, "_copy_file_locally", autospec=True, side_effect=copy
+    )
+    yield GenericWrapper()
+
+
+def _collect(wrapper, device, iperf_data):
+    wrapper.collect_logs("client", device, iperf_data)
+    return iperf_data
+
+
+@pytest.mark.parametrize("inline", [True, False])
+def test_collect_logs(wrapper, iperf_data, inline):
+    data = _collect(wrapper, DeviceStub(IPERF_LOG, inline), iperf_data)
+    assert data["fields"] == ["Interval", "Transfer", "Bitrate"]
+    assert data["data"] == IPERF_LOG_DATA
+
+
+def test_collect_logs_console_and_copy_match(wrapper, iperf_data):
+    console = _collect(wrapper, DeviceStub(IPERF_LOG), dict(iperf_data))
+    copied = _collect(wrapper, DeviceStub(IPERF_LOG, inline=False), dict(iperf_data))
+    assert console == copied
+
+
+@pytest.mark.parametrize(
+    "first, second", [(True, True), (False, False), (True, False), (False, True)]
+)
+def test_collect_logs_resume(wrapper, iperf_data, first, second):
+    # the log grows past the console read limit between the two runs
+    _collect(wrapper, DeviceStub(IPERF_LOG, first), iperf_data)
+    data = _collect(wrapper, DeviceStub(IPERF_LOG + IPERF_LOG_MORE, second), iperf_data)
+    assert data["data"] == [{"type": "data", "value": ["11.00", "5.000", "5"]}]
+
+
+@pytest.mark.parametrize("inline", [True, False])
+def test_collect_logs_reset_on_shorter_log(wrapper, iperf_data, inline):
+    _collect(wrapper, DeviceStub(IPERF_LOG + IPERF_LOG_MORE, inline), iperf_data)
+    data = _collect(wrapper, DeviceStub(IPERF_LOG_MORE, inline), iperf_data)
+    assert data["data"] == [{"type": "data", "value": ["11.00", "5.000", "5"]}]
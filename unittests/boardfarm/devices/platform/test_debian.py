@@ -0,0 +1,52 @@
+import io
+
+import pytest
+
+from boardfarm.devices.platform.debian import DebianBox
+from boardfarm.lib.bft_pexpect_helper import bft_pexpect_helper
+
+
+@pytest.fixture
+def debian_box(mocker):
+    mocker.patch.object(
+        bft_pexpect_helper.spawn, "__init__", return_value=None, autospec=True
+    )
+    for method in (
+        "check_connection",
+        "set_cli_size",
+        "print_connected_console_msg",
+        "configure_gw_ip",
+    ):
+        mocker.patch.object(DebianBox, method, return_value=None, autospec=True)
+    dev = DebianBox.__new__(DebianBox)
+    dev.prompt = ["root\\@.*:.*#"]
+    return dev
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        "wan-no-eth0, wan-static-ip:10.64.38.2/23",
+        "mgmt_dns:8.8.8.8",
+        "static-route:10.0.0.0/8-10.64.38.1",
+        "static-route",
+    ],
+)
+def test_parse_device_options_keeps_device_name(debian_box, options):
+    debian_box.parse_device_options(
+        name="wan", ipaddr="10.0.0.1", output=io.StringIO(), options=options
+    )
+    assert debian_box.name == "wan"
+
+
+def test_parse_device_options_valued_option(debian_box):
+    debian_box.parse_device_options(
+        name="wan",
+        ipaddr="10.0.0.1",
+        output=io.StringIO(),
+        options="wan-no-eth0, wan-static-ip:10.64.38.2/23",
+    )
+    assert debian_box.wan_no_eth0 is True
+    assert debian_box.static_ip is True
+    assert str(debian_box.gw) == "10.64.38.2"
+    assert debian_box.gw_prefixlen == 23
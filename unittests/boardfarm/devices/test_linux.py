@@ -4,7 +4,7 @@ import re
 import pytest
 
 from boardfarm.devices.linux import LinuxDevice
-from boardfarm.exceptions import BftIfaceNoIpV6Addr
+from boardfarm.exceptions import BftIfaceNoIpV6Addr, CodeError
 from boardfarm.lib.regexlib import ValidIpv4AddressRegex
 
 test1_1 = """# ifconfig erouter0
@@ -256,3 +256,42 @@ def test_get_interface_mask(mocker, output, expected_mask):
     dev.match = max((re.search(i, output) for i in regex), key=bool)
     print(dev.match)
     assert expected_mask == dev.get_interface_mask("erouter0")
+
+
+def _scp_device(mocker, expect_indexes, before=""):
+    mocker.patch.object(LinuxDevice, "__init__", return_value=None, autospec=True)
+    mocker.patch.object(LinuxDevice, "sendline", return_value=None, autospec=True)
+    mocker.patch.object(LinuxDevice, "sendcontrol", return_value=None, autospec=True)
+    mocker.patch.object(LinuxDevice, "expect_prompt", return_value=None, autospec=True)
+    mocker.patch.object(
+        LinuxDevice, "expect", side_effect=expect_indexes, autospec=True
+    )
+    dev = LinuxDevice()
+    dev.prompt = ["root\\@.*:.*#"]
+    dev.before = before
+    return dev
+
+
+def test_scp_sends_password_once(mocker):
+    dev = _scp_device(mocker, [1, 2])
+    dev.scp("10.0.0.1", 22, "root", "bigfoot1", "/tmp/a", "/tmp/b")
+    dev.sendline.assert_called_with(dev, "bigfoot1")
+
+
+def test_scp_reused_connection(mocker):
+    dev = _scp_device(mocker, [2])
+    dev.scp("10.0.0.1", 22, "root", "bigfoot1", "/tmp/a", "/tmp/b")
+    assert dev.sendline.call_count == 1
+
+
+@pytest.mark.parametrize(
+    "expect_indexes, before",
+    [
+        ([1, 1], "Permission denied, please try again."),
+        ([1, 2], "root@10.0.0.1: Permission denied (publickey,password)."),
+    ],
+)
+def test_scp_wrong_password(mocker, expect_indexes, before):
+    dev = _scp_device(mocker, expect_indexes, before)
+    with pytest.raises(CodeError):
+        dev.scp("10.0.0.1", 22, "root", "wrong", "/tmp/a", "/tmp/b")
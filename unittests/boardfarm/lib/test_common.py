@@ -1,5 +1,7 @@
 #!/usr/bin/env python
 """Unit tests for boardfarm.lib.common.py."""
+from ipaddress import IPv4Address, IPv6Address
+
 import pytest
 
 from boardfarm.lib import common
@@ -49,3 +51,52 @@ class TestRetryOnException:
         """The exception is raised when no retries are specified."""
         with pytest.raises(NameError):
             common.retry_on_exception(throw_error, (), -1, tout=0)
+
+
+class TestRetry:
+    """Suite of tests for boardfarm.lib.common.retry()."""
+
+    def test_retry_sleep_between_attempts(self, monkeypatch):
+        """The sleep is fixed by default and skipped after the last attempt."""
+        sleeps = []
+        monkeypatch.setattr(common.time, "sleep", sleeps.append)
+        out = common.retry(bool, 3, 0)
+        assert out is False
+        assert sleeps == [5, 5]
+
+    def test_retry_backoff_between_attempts(self, monkeypatch):
+        """With backoff the sleep doubles between attempts."""
+        sleeps = []
+        monkeypatch.setattr(common.time, "sleep", sleeps.append)
+        monkeypatch.setattr(common.random, "uniform", lambda a, b: 0)
+        out = common.retry(bool, 3, 0, backoff=True)
+        assert out is False
+        assert sleeps == [5, 10]
+
+    def test_retry_no_retry(self):
+        """The function is not called when no retries are requested."""
+        assert common.retry(throw_error, 0) is None
+
+
+class TestIpPoolToList:
+    """Suite of tests for boardfarm.lib.common.ip_pool_to_list()."""
+
+    def test_ip_pool_to_list_across_octet(self):
+        """The pool includes both boundaries and crosses octet borders."""
+        out = common.ip_pool_to_list(IPv4Address("10.0.0.254"), IPv4Address("10.0.1.1"))
+        assert out == [
+            IPv4Address("10.0.0.254"),
+            IPv4Address("10.0.0.255"),
+            IPv4Address("10.0.1.0"),
+            IPv4Address("10.0.1.1"),
+        ]
+
+    def test_ip_pool_to_list_reversed_bounds(self):
+        """An empty list is returned when the pool ends before it starts."""
+        out = common.ip_pool_to_list(IPv4Address("10.0.0.5"), IPv4Address("10.0.0.1"))
+        assert out == []
+
+    def test_ip_pool_to_list_ipv6(self):
+        """The address type of the boundaries is preserved."""
+        out = common.ip_pool_to_list(IPv6Address("2001::1"), IPv6Address("2001::2"))
+        assert out == [IPv6Address("2001::1"), IPv6Address("2001::2")]
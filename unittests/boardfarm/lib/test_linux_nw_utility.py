@@ -0,0 +1,72 @@
+import pytest
+
+from boardfarm.lib.linux_nw_utility import NwDnsLookup, NwFirewall
+
+IPTABLES_EMPTY = """Chain INPUT (policy ACCEPT 0 packets, 0 bytes)
+num   pkts bytes target     prot opt in     out     source               destination
+
+Chain FORWARD (policy ACCEPT 0 packets, 0 bytes)
+num   pkts bytes target     prot opt in     out     source               destination
+"""
+
+IPTABLES_DROP = """Chain INPUT (policy ACCEPT 0 packets, 0 bytes)
+num   pkts bytes target     prot opt in     out     source               destination
+1        0     0 DROP       all  --  *      *       10.0.0.1             0.0.0.0/0
+
+Chain FORWARD (policy ACCEPT 0 packets, 0 bytes)
+num   pkts bytes target     prot opt in     out     source               destination
+"""
+
+IPTABLES_DROP_NO_NUM = """Chain INPUT (policy ACCEPT 0 packets, 0 bytes)
+ pkts bytes target     prot opt in     out     source               destination
+    0     0 DROP       all  --  *      *       10.0.0.1             0.0.0.0/0
+"""
+
+DIG_SHORT = """www.example.com.cdn.net.
+93.184.216.34
+93.184.216.35
+www.example.com.cdn.net.
+2606:2800:220:1:248:1893:25c8:1946
+"""
+
+
+class DeviceStub:
+    def __init__(self, out):
+        self.out = out
+
+    def check_output(self, cmd):
+        self.cmd = cmd
+        return self.out
+
+
+@pytest.mark.parametrize("out, empty", [(IPTABLES_EMPTY, True), (IPTABLES_DROP, False)])
+def test_is_iptable_empty(out, empty):
+    assert (
+        NwFirewall(DeviceStub(out)).is_iptable_empty("-nvL", "--line-numbers") is empty
+    )
+
+
+def test_is_iptable_empty_without_line_numbers():
+    with pytest.raises(AssertionError):
+        NwFirewall(DeviceStub(IPTABLES_DROP_NO_NUM)).is_iptable_empty("-nvL")
+
+
+def test_is_iptable_empty_invalid_table():
+    with pytest.raises(AssertionError):
+        NwFirewall(
+            DeviceStub("iptables: No chain/target/match by that name.")
+        ).is_ip6table_empty()
+
+
+def test_dns_short():
+    dev = DeviceStub(DIG_SHORT)
+    assert NwDnsLookup(dev).short("www.example.com") == [
+        "93.184.216.34",
+        "93.184.216.35",
+        "2606:2800:220:1:248:1893:25c8:1946",
+    ]
+    assert dev.cmd.startswith("dig +short")
+
+
+def test_dns_short_unresolved():
+    assert NwDnsLookup(DeviceStub("")).short("invalid.example") == []